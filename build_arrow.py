@@ -0,0 +1,6 @@
+from main import ARROW_PATH, read_csv_frame
+
+if __name__ == "__main__":
+    # Uncompressed so the file can be memory-mapped without decoding.
+    read_csv_frame().write_ipc(ARROW_PATH, compression="uncompressed")
+    print(f"Wrote {ARROW_PATH}")
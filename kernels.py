@@ -0,0 +1,77 @@
+import os
+
+# Both must be set before numba is imported. The kernels are only launched from
+# the event-loop thread, so the plain workqueue layer is enough; numba would
+# otherwise pick tbb when it is installed, which hangs at interpreter exit once
+# a kernel has run off the main thread.
+os.environ.setdefault("NUMBA_THREADING_LAYER", "workqueue")
+# Every uvicorn worker is a separate process with its own numba thread pool;
+# split the cores between them instead of each starting one thread per core.
+_workers = max(1, int(os.environ.get("WEB_CONCURRENCY") or 1))
+os.environ.setdefault("NUMBA_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // _workers)))
+
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+# Filter codes passed to the kernels: a category id, or one of these.
+NO_FILTER = -1
+NO_MATCH = -2
+
+
+# The filter predicate is evaluated inside each kernel, so every row's columns
+# are read once while hot instead of first building a mask and re-reading.
+@njit(cache=True)
+def _matches(fcols, fvals, i):
+    for k in range(fvals.size):
+        if fvals[k] != NO_FILTER and fcols[i, k] != fvals[k]:
+            return False
+    return True
+
+
+@njit(parallel=True, cache=True)
+def _grouped_counts(fcols, fvals, codes, yes, ncats, nchunks):
+    # One accumulator row per chunk so prange iterations never share a counter.
+    step = (codes.size + nchunks - 1) // nchunks
+    total = np.zeros((nchunks, ncats), np.int64)
+    attr = np.zeros((nchunks, ncats), np.int64)
+    for t in prange(nchunks):
+        for i in range(t * step, min((t + 1) * step, codes.size)):
+            if _matches(fcols, fvals, i):
+                c = codes[i]
+                total[t, c] += 1
+                if yes[i]:
+                    attr[t, c] += 1
+    return total.sum(axis=0), attr.sum(axis=0)
+
+
+def grouped_counts(fcols, fvals, codes, yes, ncats):
+    return _grouped_counts(fcols, fvals, codes, yes, ncats, get_num_threads())
+
+
+@njit(parallel=True, cache=True)
+def _bucket_counts(fcols, fvals, values, offset, width, nbins, yes, nchunks):
+    step = (values.size + nchunks - 1) // nchunks
+    total = np.zeros((nchunks, nbins), np.int64)
+    attr = np.zeros((nchunks, nbins), np.int64)
+    for t in prange(nchunks):
+        for i in range(t * step, min((t + 1) * step, values.size)):
+            if _matches(fcols, fvals, i):
+                idx = min((values[i] - offset) // width, nbins - 1)
+                if idx >= 0:
+                    total[t, idx] += 1
+                    if yes[i]:
+                        attr[t, idx] += 1
+    return total.sum(axis=0), attr.sum(axis=0)
+
+
+def bucket_counts(fcols, fvals, values, offset, width, nbins, yes):
+    return _bucket_counts(fcols, fvals, values, offset, width, nbins, yes, get_num_threads())
+
+
+@njit(cache=True)
+def crosstab(fcols, fvals, a, b):
+    counts = np.zeros((2, 2), np.int64)
+    for i in range(a.size):
+        if _matches(fcols, fvals, i):
+            counts[int(a[i]), int(b[i])] += 1
+    return counts
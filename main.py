@@ -1,14 +1,18 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-import csv
-import json
-from collections import Counter, defaultdict
-from typing import Optional
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from functools import lru_cache, partial
+import gzip
+import hashlib
 import os
+from typing import Optional
+import numpy as np
+import orjson
+import polars as pl
+from kernels import NO_FILTER, NO_MATCH, bucket_counts, crosstab, grouped_counts
 
-app = FastAPI(title="HR Attrition Dashboard API")
+app = FastAPI(title="HR Attrition Dashboard API", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,58 +21,218 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-DATA_PATH = os.path.join(os.path.dirname(__file__), "data.csv")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, "data.csv")
+ARROW_PATH = os.path.join(BASE_DIR, "data.arrow")
+STATIC_DIR = os.path.join(BASE_DIR, "static")
 
 EDUCATION_MAP = {"1": "Below College", "2": "College", "3": "Bachelor", "4": "Master", "5": "Doctor"}
 
+SCHEMA_OVERRIDES = {
+    "Age": pl.Int32,
+    "MonthlyIncome": pl.Int32,
+    "YearsAtCompany": pl.Int16,
+    "JobSatisfaction": pl.Int8,
+    "EnvironmentSatisfaction": pl.Int8,
+    "RelationshipSatisfaction": pl.Int8,
+    "WorkLifeBalance": pl.Int8,
+    "JobInvolvement": pl.Int8,
+    "Attrition": pl.String,
+    "OverTime": pl.String,
+    "Gender": pl.String,
+    "Department": pl.String,
+    "JobRole": pl.String,
+    "Education": pl.String,
+    "EducationField": pl.String,
+}
+
+NUMERIC_COLUMNS = [
+    "Age",
+    "MonthlyIncome",
+    "YearsAtCompany",
+    "JobSatisfaction",
+    "EnvironmentSatisfaction",
+    "RelationshipSatisfaction",
+    "WorkLifeBalance",
+    "JobInvolvement",
+]
+CATEGORICAL_COLUMNS = ["Gender", "Department", "JobRole", "Education", "EducationField"]
+FILTER_COLUMNS = ["Gender", "JobRole", "Education", "Department"]
+
+def read_csv_frame():
+    return pl.read_csv(DATA_PATH, columns=list(SCHEMA_OVERRIDES), schema_overrides=SCHEMA_OVERRIDES)
+
+def read_frame():
+    # Prefer the Arrow file written by build_arrow.py, which loads without CSV
+    # parsing. Fall back to the CSV if it is missing or older than data.csv.
+    if os.path.exists(ARROW_PATH) and os.path.getmtime(ARROW_PATH) >= os.path.getmtime(DATA_PATH):
+        return pl.read_ipc(ARROW_PATH)
+    return read_csv_frame()
+
+class Dataset:
+    # Everything derived from one load of the data. A reload builds a new one and
+    # only publishes it once its frozen responses are rendered, so a reload that
+    # fails leaves the previous copy serving and is retried on the next request.
+    def __init__(self, df, mtime):
+        cols = {name: df[name].to_numpy() for name in NUMERIC_COLUMNS}
+        cols["AttritionYes"] = (df["Attrition"] == "Yes").to_numpy()
+        cols["OverTimeYes"] = (df["OverTime"] == "Yes").to_numpy()
+        cols["AttritionBits"] = np.packbits(cols["AttritionYes"])
+        cols["AllBits"] = np.packbits(np.ones(df.height, dtype=bool))
+        labels = {}
+        for name in CATEGORICAL_COLUMNS:
+            # Blank cells come back as null; keep them as a "" label like the CSV has.
+            cats, codes = np.unique(df[name].fill_null("").to_numpy(), return_inverse=True)
+            if len(cats) > 127:
+                raise ValueError(f"{name} has {len(cats)} categories; int8 codes hold at most 127")
+            labels[name] = cats.tolist()
+            cols[name] = codes.astype(np.int8)
+        # One row of filter codes per employee, so the kernels read a row's codes together.
+        cols["Filters"] = np.stack([cols[name] for name in FILTER_COLUMNS], axis=1)
+        self.cols = cols
+        self.labels = labels
+        self.filter_masks = {
+            name: {v: np.packbits(cols[name] == i) for i, v in enumerate(labels[name])}
+            for name in FILTER_COLUMNS
+        }
+        self.filter_ids = {name: {v: i for i, v in enumerate(labels[name])} for name in FILTER_COLUMNS}
+        self.filter_options = {
+            "genders": labels["Gender"],
+            "job_roles": labels["JobRole"],
+            "educations": [
+                {"value": k, "label": v}
+                for k, v in sorted(EDUCATION_MAP.items(), key=lambda x: x[0])
+            ],
+            "departments": labels["Department"],
+        }
+        self.mtime = mtime
+        self.frozen = _freeze_responses(self)
+
+_DATA = None
+
+def _read_cols():
+    global _DATA
+    mtime = os.path.getmtime(DATA_PATH)
+    if _DATA is None or _DATA.mtime != mtime:
+        _DATA = Dataset(read_frame(), mtime)
+        _filter_masks.cache_clear()
+        _cached_body.cache_clear()
+    return _DATA
+
+@app.on_event("startup")
+def load_cols():
+    if not os.path.exists(DATA_PATH):
+        raise RuntimeError(f"Dataset not found at {DATA_PATH}")
+    # Loading also renders the frozen responses, which compiles the numba
+    # kernels now rather than on the first request.
+    _read_cols()
+
+@lru_cache(maxsize=512)
+def _filter_masks(data, gender, job_role, education, department):
+    # Every chart on the dashboard requests the same filter combination, so
+    # resolve it once and share the packed and unpacked masks between them.
+    bits = data.cols["AllBits"]
+    for name, value in zip(FILTER_COLUMNS, (gender, job_role, education, department)):
+        if value:
+            value_bits = data.filter_masks[name].get(value)
+            if value_bits is None:
+                bits = np.zeros_like(bits)
+                break
+            bits = bits & value_bits
+    mask = unpack(data.cols, bits)
+    bits.flags.writeable = False
+    mask.flags.writeable = False
+    return bits, mask
+
+def unpack(cols, bits):
+    return np.unpackbits(bits, count=cols["AttritionYes"].size).view(bool)
+
 def load_data(
+    data: Dataset,
+    gender: Optional[str] = None,
+    job_role: Optional[str] = None,
+    education: Optional[str] = None,
+    department: Optional[str] = None,
+):
+    return data.cols, *_filter_masks(data, gender, job_role, education, department)
+
+def load_codes(
+    data: Dataset,
     gender: Optional[str] = None,
     job_role: Optional[str] = None,
     education: Optional[str] = None,
     department: Optional[str] = None,
 ):
-    rows = []
-    with open(DATA_PATH, encoding="utf-8-sig") as f:
-        for row in csv.DictReader(f):
-            if gender and row["Gender"] != gender:
-                continue
-            if job_role and row["JobRole"] != job_role:
-                continue
-            if education and row["Education"] != education:
-                continue
-            if department and row["Department"] != department:
-                continue
-            rows.append(row)
-    return rows
+    # For the numba kernels, which apply the filters themselves row by row.
+    fvals = np.array([
+        data.filter_ids[name].get(value, NO_MATCH) if value else NO_FILTER
+        for name, value in zip(FILTER_COLUMNS, (gender, job_role, education, department))
+    ], dtype=np.int64)
+    return data.cols, fvals
+
+def attrition_counts(data, fvals, by: str):
+    cols = data.cols
+    total, attr = grouped_counts(cols["Filters"], fvals, cols[by], cols["AttritionYes"], len(data.labels[by]))
+    present = total > 0
+    labels = [l for l, p in zip(data.labels[by], present) if p]
+    return labels, total[present].tolist(), attr[present].tolist()
+
+@lru_cache(maxsize=512)
+def _cached_body(data, fn, *params):
+    body = orjson.dumps(fn(data, *params))
+    gz = gzip.compress(body, mtime=0)
+    # Small bodies can grow under gzip; only keep the compressed copy if it pays off.
+    return body, gz if len(gz) < len(body) else None, hashlib.sha1(body).hexdigest()
+
+def _freeze_responses(data):
+    # The unfiltered dashboard and every single-filter view are rendered up
+    # front and kept outside the LRU cache, so they can never be evicted.
+    keys = [(filter_options,)]
+    for fn in FILTERED_ENDPOINTS.values():
+        keys.append((fn, None, None, None, None))
+        for i, name in enumerate(FILTER_COLUMNS):
+            for value in data.labels[name]:
+                params = [None] * len(FILTER_COLUMNS)
+                params[i] = value
+                keys.append((fn, *params))
+    return {key: _cached_body.__wrapped__(data, *key) for key in keys}
+
+def cached_json(request: Request, fn, *params):
+    data = _read_cols()
+    key = (fn, *(p or None for p in params))
+    body, gz, digest = data.frozen.get(key) or _cached_body(data, *key)
+    headers = {"ETag": f'"{digest}"', "Vary": "Accept-Encoding"}
+    if gz is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gz
+        headers["ETag"] = f'"{digest}-gzip"'
+        headers["Content-Encoding"] = "gzip"
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers={"ETag": headers["ETag"], "Vary": "Accept-Encoding"})
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def filter_options(data):
+    return data.filter_options
 
 @app.get("/api/filters")
-def get_filters():
-    rows = load_data()
-    return {
-        "genders": sorted(set(r["Gender"] for r in rows)),
-        "job_roles": sorted(set(r["JobRole"] for r in rows)),
-        "educations": [
-            {"value": k, "label": v}
-            for k, v in sorted(EDUCATION_MAP.items(), key=lambda x: x[0])
-        ],
-        "departments": sorted(set(r["Department"] for r in rows)),
-    }
+async def get_filters(request: Request):
+    return cached_json(request, filter_options)
 
-@app.get("/api/kpis")
-def get_kpis(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
+def kpis(
+    data: Dataset,
+    gender: Optional[str] = None,
+    job_role: Optional[str] = None,
+    education: Optional[str] = None,
+    department: Optional[str] = None,
 ):
-    rows = load_data(gender, job_role, education, department)
-    total = len(rows)
+    cols, bits, mask = load_data(data, gender, job_role, education, department)
+    total = int(np.bitwise_count(bits).sum())
     if total == 0:
         return {"total": 0, "attrition_rate": 0, "avg_age": 0, "avg_income": 0, "avg_satisfaction": 0}
-    attrition = sum(1 for r in rows if r["Attrition"] == "Yes")
-    avg_age = sum(int(r["Age"]) for r in rows) / total
-    avg_income = sum(int(r["MonthlyIncome"]) for r in rows) / total
-    avg_sat = sum(int(r["JobSatisfaction"]) for r in rows) / total
+    attrition = int(np.bitwise_count(bits & cols["AttritionBits"]).sum())
+    sub = np.flatnonzero(mask)
+    avg_age = float(cols["Age"][sub].mean())
+    avg_income = float(cols["MonthlyIncome"][sub].mean())
+    avg_sat = float(cols["JobSatisfaction"][sub].mean())
     return {
         "total": total,
         "attrition_rate": round(attrition / total * 100, 1),
@@ -77,210 +241,149 @@ def get_kpis(
         "avg_satisfaction": round(avg_sat, 2),
     }
 
-@app.get("/api/attrition-by-department")
-def attrition_by_department(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
-):
-    rows = load_data(gender, job_role, education, department)
-    dept_total = Counter()
-    dept_attr = Counter()
-    for r in rows:
-        dept_total[r["Department"]] += 1
-        if r["Attrition"] == "Yes":
-            dept_attr[r["Department"]] += 1
-    labels = sorted(dept_total.keys())
-    return {
-        "labels": labels,
-        "total": [dept_total[l] for l in labels],
-        "attrition": [dept_attr[l] for l in labels],
-        "rate": [round(dept_attr[l] / dept_total[l] * 100, 1) if dept_total[l] else 0 for l in labels],
-    }
+# Endpoints that count employees per category: path -> (column, include rate)
+GROUP_SPECS = {
+    "/api/attrition-by-department": ("Department", True),
+    "/api/attrition-by-jobrole": ("JobRole", True),
+    "/api/gender-split": ("Gender", False),
+    "/api/education-field": ("EducationField", False),
+}
 
+def grouped(spec, data, gender=None, job_role=None, education=None, department=None):
+    by, with_rate = spec
+    _, fvals = load_codes(data, gender, job_role, education, department)
+    labels, total, attr = attrition_counts(data, fvals, by)
+    out = {"labels": labels, "total": total, "attrition": attr}
+    if with_rate:
+        out["rate"] = [round(a / t * 100, 1) if t else 0 for t, a in zip(total, attr)]
+    return out
 
-@app.get("/api/attrition-by-jobrole")
-def attrition_by_jobrole(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
-):
-    rows = load_data(gender, job_role, education, department)
-    role_total = Counter()
-    role_attr = Counter()
-    for r in rows:
-        role_total[r["JobRole"]] += 1
-        if r["Attrition"] == "Yes":
-            role_attr[r["JobRole"]] += 1
-    labels = sorted(role_total.keys())
-    return {
-        "labels": labels,
-        "total": [role_total[l] for l in labels],
-        "attrition": [role_attr[l] for l in labels],
-        "rate": [round(role_attr[l] / role_total[l] * 100, 1) if role_total[l] else 0 for l in labels],
-    }
+# Fixed-width histograms: path -> (column, first value, bin width, labels, stayed/left split)
+BUCKET_SPECS = {
+    "/api/age-distribution": ("Age", 18, 5, [f"{b}-{b+4}" for b in range(18, 65, 5)], False),
+    "/api/satisfaction-distribution": (
+        "JobSatisfaction", 1, 1, ["1 - Low", "2 - Medium", "3 - High", "4 - Very High"], True,
+    ),
+}
 
-@app.get("/api/age-distribution")
-def age_distribution(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
-):
-    rows = load_data(gender, job_role, education, department)
-    bins = list(range(18, 65, 5))
-    labels = [f"{b}-{b+4}" for b in bins]
-    total_counts = [0] * len(bins)
-    attr_counts = [0] * len(bins)
-    for r in rows:
-        age = int(r["Age"])
-        idx = min((age - 18) // 5, len(bins) - 1)
-        if 0 <= idx < len(bins):
-            total_counts[idx] += 1
-            if r["Attrition"] == "Yes":
-                attr_counts[idx] += 1
-    return {"labels": labels, "total": total_counts, "attrition": attr_counts}
-
-@app.get("/api/gender-split")
-def gender_split(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
-):
-    rows = load_data(gender, job_role, education, department)
-    cnt = Counter(r["Gender"] for r in rows)
-    attr_cnt = Counter(r["Gender"] for r in rows if r["Attrition"] == "Yes")
-    labels = sorted(cnt.keys())
-    return {
-        "labels": labels,
-        "total": [cnt[l] for l in labels],
-        "attrition": [attr_cnt[l] for l in labels],
-    }
+def bucketed(spec, data, gender=None, job_role=None, education=None, department=None):
+    column, offset, width, labels, split = spec
+    cols, fvals = load_codes(data, gender, job_role, education, department)
+    total, attr = bucket_counts(cols["Filters"], fvals, cols[column], offset, width, len(labels), cols["AttritionYes"])
+    if split:
+        return {"labels": labels, "stayed": (total - attr).tolist(), "left": attr.tolist()}
+    return {"labels": labels, "total": total.tolist(), "attrition": attr.tolist()}
 
-@app.get("/api/income-by-role")
 def income_by_role(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
+    data: Dataset,
+    gender: Optional[str] = None,
+    job_role: Optional[str] = None,
+    education: Optional[str] = None,
+    department: Optional[str] = None,
 ):
-    rows = load_data(gender, job_role, education, department)
-    role_income = defaultdict(list)
-    for r in rows:
-        role_income[r["JobRole"]].append(int(r["MonthlyIncome"]))
-    labels = sorted(role_income.keys())
+    cols, _, mask = load_data(data, gender, job_role, education, department)
+    roles = cols["JobRole"][mask]
+    ncats = len(data.labels["JobRole"])
+    counts = np.bincount(roles, minlength=ncats)
+    sums = np.bincount(roles, weights=cols["MonthlyIncome"][mask], minlength=ncats)
+    present = counts > 0
     return {
-        "labels": labels,
-        "avg_income": [round(sum(role_income[l]) / len(role_income[l])) if role_income[l] else 0 for l in labels],
+        "labels": [l for l, p in zip(data.labels["JobRole"], present) if p],
+        "avg_income": [round(s / c) for s, c in zip(sums[present].tolist(), counts[present].tolist())],
     }
 
-@app.get("/api/satisfaction-distribution")
-def satisfaction_distribution(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
-):
-    rows = load_data(gender, job_role, education, department)
-    sat_labels = ["1 - Low", "2 - Medium", "3 - High", "4 - Very High"]
-    stayed = [0, 0, 0, 0]
-    left = [0, 0, 0, 0]
-    for r in rows:
-        idx = int(r["JobSatisfaction"]) - 1
-        if r["Attrition"] == "Yes":
-            left[idx] += 1
-        else:
-            stayed[idx] += 1
-    return {"labels": sat_labels, "stayed": stayed, "left": left}
-
-@app.get("/api/overtime-attrition")
 def overtime_attrition(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
+    data: Dataset,
+    gender: Optional[str] = None,
+    job_role: Optional[str] = None,
+    education: Optional[str] = None,
+    department: Optional[str] = None,
 ):
-    rows = load_data(gender, job_role, education, department)
-    data = {"Yes": {"Yes": 0, "No": 0}, "No": {"Yes": 0, "No": 0}}
-    for r in rows:
-        data[r["OverTime"]][r["Attrition"]] += 1
+    cols, fvals = load_codes(data, gender, job_role, education, department)
+    counts = crosstab(cols["Filters"], fvals, cols["OverTimeYes"], cols["AttritionYes"])
     return {
         "labels": ["With Overtime", "Without Overtime"],
-        "stayed": [data["Yes"]["No"], data["No"]["No"]],
-        "left": [data["Yes"]["Yes"], data["No"]["Yes"]],
+        "stayed": [int(counts[1, 0]), int(counts[0, 0])],
+        "left": [int(counts[1, 1]), int(counts[0, 1])],
     }
 
-@app.get("/api/education-field")
-def education_field(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
-):
-    rows = load_data(gender, job_role, education, department)
-    cnt = Counter(r["EducationField"] for r in rows)
-    attr = Counter(r["EducationField"] for r in rows if r["Attrition"] == "Yes")
-    labels = sorted(cnt.keys())
-    return {
-        "labels": labels,
-        "total": [cnt[l] for l in labels],
-        "attrition": [attr[l] for l in labels],
-    }
-
-@app.get("/api/years-attrition")
 def years_attrition(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
+    data: Dataset,
+    gender: Optional[str] = None,
+    job_role: Optional[str] = None,
+    education: Optional[str] = None,
+    department: Optional[str] = None,
 ):
-    rows = load_data(gender, job_role, education, department)
-    year_total = Counter()
-    year_attr = Counter()
-    for r in rows:
-        y = int(r["YearsAtCompany"])
-        year_total[y] += 1
-        if r["Attrition"] == "Yes":
-            year_attr[y] += 1
-    max_year = max(year_total.keys()) if year_total else 0
-    labels = list(range(0, min(max_year + 1, 41)))
-    rates = [round(year_attr[y] / year_total[y] * 100, 1) if year_total[y] else 0 for y in labels]
-    totals = [year_total[y] for y in labels]
-    return {"labels": labels, "attrition_rate": rates, "total": totals}
-
-@app.get("/api/worklife-balance")
+    cols, fvals = load_codes(data, gender, job_role, education, department)
+    years = cols["YearsAtCompany"]
+    year_total, year_attr = bucket_counts(
+        cols["Filters"], fvals, years, 0, 1, int(years.max(initial=0)) + 1, cols["AttritionYes"]
+    )
+    present = np.flatnonzero(year_total)
+    size = min(int(present[-1]) + 1, 41) if present.size else 1
+    year_total, year_attr = year_total[:size], year_attr[:size]
+    labels = list(range(size))
+    rates = [round(a / t * 100, 1) if t else 0 for t, a in zip(year_total.tolist(), year_attr.tolist())]
+    return {"labels": labels, "attrition_rate": rates, "total": year_total.tolist()}
+
 def worklife_balance(
-    gender: Optional[str] = Query(None),
-    job_role: Optional[str] = Query(None),
-    education: Optional[str] = Query(None),
-    department: Optional[str] = Query(None),
+    data: Dataset,
+    gender: Optional[str] = None,
+    job_role: Optional[str] = None,
+    education: Optional[str] = None,
+    department: Optional[str] = None,
 ):
-    rows = load_data(gender, job_role, education, department)
+    cols, _, mask = load_data(data, gender, job_role, education, department)
     metrics = ["JobSatisfaction", "EnvironmentSatisfaction", "RelationshipSatisfaction", "WorkLifeBalance", "JobInvolvement"]
+    sub = np.flatnonzero(mask)
+    left = cols["AttritionYes"][sub].view(np.uint8)
+    counts = np.bincount(left, minlength=2).tolist()
     stayed_avgs = []
     left_avgs = []
     for m in metrics:
-        stayed = [int(r[m]) for r in rows if r["Attrition"] == "No"]
-        left = [int(r[m]) for r in rows if r["Attrition"] == "Yes"]
-        stayed_avgs.append(round(sum(stayed) / len(stayed), 2) if stayed else 0)
-        left_avgs.append(round(sum(left) / len(left), 2) if left else 0)
+        sums = np.bincount(left, weights=cols[m][sub], minlength=2).tolist()
+        stayed_avgs.append(round(sums[0] / counts[0], 2) if counts[0] else 0)
+        left_avgs.append(round(sums[1] / counts[1], 2) if counts[1] else 0)
     labels = ["Job Satisfaction", "Environment", "Relationships", "Work-Life Balance", "Job Involvement"]
     return {"labels": labels, "stayed": stayed_avgs, "left": left_avgs}
 
+FILTERED_ENDPOINTS = {
+    "/api/kpis": kpis,
+    **{path: partial(grouped, spec) for path, spec in GROUP_SPECS.items()},
+    **{path: partial(bucketed, spec) for path, spec in BUCKET_SPECS.items()},
+    "/api/income-by-role": income_by_role,
+    "/api/overtime-attrition": overtime_attrition,
+    "/api/years-attrition": years_attrition,
+    "/api/worklife-balance": worklife_balance,
+}
+
+def _filtered_route(fn):
+    async def endpoint(
+        request: Request,
+        gender: Optional[str] = Query(None),
+        job_role: Optional[str] = Query(None),
+        education: Optional[str] = Query(None),
+        department: Optional[str] = Query(None),
+    ):
+        return cached_json(request, fn, gender, job_role, education, department)
+    return endpoint
+
+for path, fn in FILTERED_ENDPOINTS.items():
+    # Named as the per-endpoint handlers were, which keeps the OpenAPI operation ids and summaries.
+    name = "get_" + path.removeprefix("/api/").replace("-", "_")
+    app.add_api_route(path, _filtered_route(fn), methods=["GET"], name=name)
+
 @app.get("/health")
 @app.head("/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 @app.get("/")
 @app.head("/")
-def serve_frontend():
-    return FileResponse("static/index.html")
+async def serve_frontend():
+    return FileResponse(os.path.join(STATIC_DIR, "index.html"))
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,178 +1,236 @@
-import csv, json, os
-from collections import Counter, defaultdict
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import csv, gzip, hashlib, json, os, threading
+from collections import defaultdict
+from functools import lru_cache, partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 
-DATA_PATH = os.path.join(os.path.dirname(__file__), "data.csv")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, "data.csv")
 EDUCATION_MAP = {"1": "Below College", "2": "College", "3": "Bachelor", "4": "Master", "5": "Doctor"}
 
-def load_data(gender=None, job_role=None, education=None, department=None):
-    rows = []
-    with open(DATA_PATH, encoding="utf-8-sig") as f:
-        for row in csv.DictReader(f):
-            if gender and row["Gender"] != gender: continue
-            if job_role and row["JobRole"] != job_role: continue
-            if education and row["Education"] != education: continue
-            if department and row["Department"] != department: continue
-            rows.append(row)
-    return rows
+FILTER_KEYS = ("gender", "job_role", "education", "department")
+FILTER_FIELDS = ("Gender", "JobRole", "Education", "Department")
+GROUP_FIELDS = ("Gender", "Department", "JobRole", "EducationField")
+INT_FIELDS = ("Age", "MonthlyIncome", "YearsAtCompany", "JobSatisfaction", "EnvironmentSatisfaction",
+              "RelationshipSatisfaction", "WorkLifeBalance", "JobInvolvement")
+
+class Dataset:
+    # Everything derived from one read of data.csv. A reload builds a new one and
+    # only publishes it once its frozen responses are rendered, so request
+    # threads never see a half-built copy.
+    def __init__(self, rows, mtime):
+        for r in rows:
+            for field in INT_FIELDS: r[field] = int(r[field])
+        # Fixed sort order per category, with each row tagged by its position, so
+        # group-bys index into plain lists instead of hashing and sorting strings.
+        self.order = {field: sorted({r[field] for r in rows}) for field in GROUP_FIELDS}
+        for field, labels in self.order.items():
+            ids = {v: i for i, v in enumerate(labels)}
+            for r in rows: r[field + "Id"] = ids[r[field]]
+        self.max_year = max((r["YearsAtCompany"] for r in rows), default=0)
+        self.index = {field: defaultdict(set) for field in FILTER_FIELDS}
+        for i, r in enumerate(rows):
+            for field, index in self.index.items(): index[r[field]].add(i)
+        self.filter_options = {
+            "genders": self.order["Gender"],
+            "job_roles": self.order["JobRole"],
+            "educations": [{"value": k, "label": v} for k, v in sorted(EDUCATION_MAP.items())],
+            "departments": self.order["Department"],
+        }
+        self.rows = rows
+        self.mtime = mtime
+        self.frozen = freeze_responses(self)
+
+_DATA = None
+_LOCK = threading.Lock()
+
+def _read_rows():
+    global _DATA
+    mtime = os.path.getmtime(DATA_PATH)
+    if _DATA is None or _DATA.mtime != mtime:
+        with _LOCK:
+            # Another thread may have finished the reload while this one waited.
+            if _DATA is None or _DATA.mtime != mtime:
+                with open(DATA_PATH, encoding="utf-8-sig") as f:
+                    _DATA = Dataset(list(csv.DictReader(f)), mtime)
+                cached_body.cache_clear()
+    return _DATA
+
+def load_data(data, gender=None, job_role=None, education=None, department=None):
+    ids = None
+    for field, value in zip(FILTER_FIELDS, (gender, job_role, education, department)):
+        if value:
+            match = data.index[field].get(value, set())
+            ids = match if ids is None else ids & match
+    if ids is None: return data.rows
+    return [data.rows[i] for i in sorted(ids)]
+
+def group_counts(data, rows, field):
+    key = field + "Id"
+    total = [0]*len(data.order[field]); attr = [0]*len(data.order[field])
+    for r in rows:
+        i = r[key]; total[i] += 1
+        if r["Attrition"] == "Yes": attr[i] += 1
+    present = [i for i, t in enumerate(total) if t]
+    return [data.order[field][i] for i in present], [total[i] for i in present], [attr[i] for i in present]
 
 def get_params(qs):
     p = parse_qs(qs)
-    return {
-        "gender": p.get("gender", [None])[0],
-        "job_role": p.get("job_role", [None])[0],
-        "education": p.get("education", [None])[0],
-        "department": p.get("department", [None])[0],
-    }
+    return {k: p.get(k, [None])[0] or None for k in FILTER_KEYS}
 
-def api_filters():
-    rows = load_data()
-    return {
-        "genders": sorted(set(r["Gender"] for r in rows)),
-        "job_roles": sorted(set(r["JobRole"] for r in rows)),
-        "educations": [{"value": k, "label": v} for k, v in sorted(EDUCATION_MAP.items())],
-        "departments": sorted(set(r["Department"] for r in rows)),
-    }
+def api_filters(data):
+    return data.filter_options
 
-def api_kpis(p):
-    rows = load_data(**p)
+def api_kpis(data, p):
+    rows = load_data(data, **p)
     total = len(rows)
     if total == 0:
         return {"total": 0, "attrition_rate": 0, "avg_age": 0, "avg_income": 0, "avg_satisfaction": 0}
-    attr = sum(1 for r in rows if r["Attrition"] == "Yes")
+    attr = age = income = sat = 0
+    for r in rows:
+        if r["Attrition"] == "Yes": attr += 1
+        age += r["Age"]; income += r["MonthlyIncome"]; sat += r["JobSatisfaction"]
     return {
         "total": total,
         "attrition_rate": round(attr / total * 100, 1),
-        "avg_age": round(sum(int(r["Age"]) for r in rows) / total, 1),
-        "avg_income": round(sum(int(r["MonthlyIncome"]) for r in rows) / total),
-        "avg_satisfaction": round(sum(int(r["JobSatisfaction"]) for r in rows) / total, 2),
+        "avg_age": round(age / total, 1),
+        "avg_income": round(income / total),
+        "avg_satisfaction": round(sat / total, 2),
     }
 
-def api_attrition_dept(p):
-    rows = load_data(**p)
-    total = Counter(); attr = Counter()
-    for r in rows:
-        total[r["Department"]] += 1
-        if r["Attrition"] == "Yes": attr[r["Department"]] += 1
-    labels = sorted(total.keys())
-    return {"labels": labels, "total": [total[l] for l in labels], "attrition": [attr[l] for l in labels],
-            "rate": [round(attr[l]/total[l]*100,1) if total[l] else 0 for l in labels]}
-
-def api_attrition_jobrole(p):
-    rows = load_data(**p)
-    total = Counter(); attr = Counter()
-    for r in rows:
-        total[r["JobRole"]] += 1
-        if r["Attrition"] == "Yes": attr[r["JobRole"]] += 1
-    labels = sorted(total.keys())
-    return {"labels": labels, "total": [total[l] for l in labels], "attrition": [attr[l] for l in labels],
-            "rate": [round(attr[l]/total[l]*100,1) if total[l] else 0 for l in labels]}
-
-def api_age_dist(p):
-    rows = load_data(**p)
-    bins = list(range(18, 65, 5)); labels = [f"{b}-{b+4}" for b in bins]
-    tc = [0]*len(bins); ac = [0]*len(bins)
-    for r in rows:
-        idx = min((int(r["Age"])-18)//5, len(bins)-1)
-        if 0 <= idx < len(bins):
+# Per-category counts: path -> (field, include rate)
+GROUP_SPECS = {
+    "/api/attrition-by-department": ("Department", True),
+    "/api/attrition-by-jobrole": ("JobRole", True),
+    "/api/gender-split": ("Gender", False),
+    "/api/education-field": ("EducationField", False),
+}
+
+def api_grouped(spec, data, p):
+    field, with_rate = spec
+    labels, total, attr = group_counts(data, load_data(data, **p), field)
+    out = {"labels": labels, "total": total, "attrition": attr}
+    if with_rate: out["rate"] = [round(a/t*100,1) if t else 0 for t, a in zip(total, attr)]
+    return out
+
+# Fixed-width histograms: path -> (field, first value, bin width, labels, stayed/left split)
+BUCKET_SPECS = {
+    "/api/age-distribution": ("Age", 18, 5, [f"{b}-{b+4}" for b in range(18, 65, 5)], False),
+    "/api/satisfaction-distribution": ("JobSatisfaction", 1, 1, ["1 - Low","2 - Medium","3 - High","4 - Very High"], True),
+}
+
+def api_bucketed(spec, data, p):
+    field, offset, width, labels, split = spec
+    tc = [0]*len(labels); ac = [0]*len(labels)
+    for r in load_data(data, **p):
+        idx = min((r[field]-offset)//width, len(labels)-1)
+        if idx >= 0:
             tc[idx] += 1
             if r["Attrition"] == "Yes": ac[idx] += 1
+    if split: return {"labels": labels, "stayed": [t-a for t, a in zip(tc, ac)], "left": ac}
     return {"labels": labels, "total": tc, "attrition": ac}
 
-def api_gender_split(p):
-    rows = load_data(**p)
-    cnt = Counter(r["Gender"] for r in rows)
-    attr = Counter(r["Gender"] for r in rows if r["Attrition"] == "Yes")
-    labels = sorted(cnt.keys())
-    return {"labels": labels, "total": [cnt[l] for l in labels], "attrition": [attr[l] for l in labels]}
-
-def api_income_role(p):
-    rows = load_data(**p)
-    role_income = defaultdict(list)
-    for r in rows: role_income[r["JobRole"]].append(int(r["MonthlyIncome"]))
-    labels = sorted(role_income.keys())
-    return {"labels": labels, "avg_income": [round(sum(role_income[l])/len(role_income[l])) if role_income[l] else 0 for l in labels]}
-
-def api_satisfaction(p):
-    rows = load_data(**p)
-    labels = ["1 - Low","2 - Medium","3 - High","4 - Very High"]
-    stayed = [0,0,0,0]; left = [0,0,0,0]
+def api_income_role(data, p):
+    rows = load_data(data, **p)
+    sums = [0]*len(data.order["JobRole"]); counts = [0]*len(data.order["JobRole"])
     for r in rows:
-        idx = int(r["JobSatisfaction"])-1
-        if r["Attrition"] == "Yes": left[idx] += 1
-        else: stayed[idx] += 1
-    return {"labels": labels, "stayed": stayed, "left": left}
-
-def api_overtime(p):
-    rows = load_data(**p)
-    data = {"Yes": {"Yes":0,"No":0}, "No": {"Yes":0,"No":0}}
-    for r in rows: data[r["OverTime"]][r["Attrition"]] += 1
+        i = r["JobRoleId"]; sums[i] += r["MonthlyIncome"]; counts[i] += 1
+    present = [i for i, c in enumerate(counts) if c]
+    return {"labels": [data.order["JobRole"][i] for i in present], "avg_income": [round(sums[i]/counts[i]) for i in present]}
+
+def api_overtime(data, p):
+    rows = load_data(data, **p)
+    counts = {"Yes": {"Yes":0,"No":0}, "No": {"Yes":0,"No":0}}
+    for r in rows: counts[r["OverTime"]][r["Attrition"]] += 1
     return {"labels": ["With Overtime","Without Overtime"],
-            "stayed": [data["Yes"]["No"],data["No"]["No"]],
-            "left": [data["Yes"]["Yes"],data["No"]["Yes"]]}
-
-def api_edu_field(p):
-    rows = load_data(**p)
-    cnt = Counter(r["EducationField"] for r in rows)
-    attr = Counter(r["EducationField"] for r in rows if r["Attrition"] == "Yes")
-    labels = sorted(cnt.keys())
-    return {"labels": labels, "total": [cnt[l] for l in labels], "attrition": [attr[l] for l in labels]}
-
-def api_years_attrition(p):
-    rows = load_data(**p)
-    yt = Counter(); ya = Counter()
+            "stayed": [counts["Yes"]["No"],counts["No"]["No"]],
+            "left": [counts["Yes"]["Yes"],counts["No"]["Yes"]]}
+
+def api_years_attrition(data, p):
+    rows = load_data(data, **p)
+    yt = [0]*(data.max_year+1); ya = [0]*(data.max_year+1)
     for r in rows:
-        y = int(r["YearsAtCompany"]); yt[y] += 1
+        y = r["YearsAtCompany"]; yt[y] += 1
         if r["Attrition"] == "Yes": ya[y] += 1
-    mx = max(yt.keys()) if yt else 0
+    mx = max((y for y, t in enumerate(yt) if t), default=0)
     labels = list(range(0, min(mx+1,41)))
     return {"labels": labels, "attrition_rate": [round(ya[y]/yt[y]*100,1) if yt[y] else 0 for y in labels], "total": [yt[y] for y in labels]}
 
-def api_worklife(p):
-    rows = load_data(**p)
+def api_worklife(data, p):
+    rows = load_data(data, **p)
     metrics = ["JobSatisfaction","EnvironmentSatisfaction","RelationshipSatisfaction","WorkLifeBalance","JobInvolvement"]
     labels = ["Job Satisfaction","Environment","Relationships","Work-Life Balance","Job Involvement"]
-    stayed_avgs, left_avgs = [], []
-    for m in metrics:
-        stayed = [int(r[m]) for r in rows if r["Attrition"] == "No"]
-        left = [int(r[m]) for r in rows if r["Attrition"] == "Yes"]
-        stayed_avgs.append(round(sum(stayed)/len(stayed),2) if stayed else 0)
-        left_avgs.append(round(sum(left)/len(left),2) if left else 0)
+    sums = {"No": [0]*len(metrics), "Yes": [0]*len(metrics)}; counts = {"No": 0, "Yes": 0}
+    for r in rows:
+        a = r["Attrition"]; counts[a] += 1; s = sums[a]
+        for i, m in enumerate(metrics): s[i] += r[m]
+    stayed_avgs = [round(x/counts["No"],2) if counts["No"] else 0 for x in sums["No"]]
+    left_avgs = [round(x/counts["Yes"],2) if counts["Yes"] else 0 for x in sums["Yes"]]
     return {"labels": labels, "stayed": stayed_avgs, "left": left_avgs}
 
 ROUTES = {
     "/api/filters": (api_filters, False),
     "/api/kpis": (api_kpis, True),
-    "/api/attrition-by-department": (api_attrition_dept, True),
-    "/api/attrition-by-jobrole": (api_attrition_jobrole, True),
-    "/api/age-distribution": (api_age_dist, True),
-    "/api/gender-split": (api_gender_split, True),
+    **{path: (partial(api_grouped, spec), True) for path, spec in GROUP_SPECS.items()},
+    **{path: (partial(api_bucketed, spec), True) for path, spec in BUCKET_SPECS.items()},
     "/api/income-by-role": (api_income_role, True),
-    "/api/satisfaction-distribution": (api_satisfaction, True),
     "/api/overtime-attrition": (api_overtime, True),
-    "/api/education-field": (api_edu_field, True),
     "/api/years-attrition": (api_years_attrition, True),
     "/api/worklife-balance": (api_worklife, True),
 }
 
+@lru_cache(maxsize=512)
+def cached_body(path, filters, data):
+    fn, needs_params = ROUTES[path]
+    result = fn(data, dict(zip(FILTER_KEYS, filters))) if needs_params else fn(data)
+    body = json.dumps(result).encode()
+    gz = gzip.compress(body, mtime=0)
+    return body, gz if len(gz) < len(body) else None, hashlib.sha1(body).hexdigest()
+
+def freeze_responses(data):
+    # Unfiltered and single-filter views never go through the LRU cache.
+    keys = []
+    for path, (fn, needs_params) in ROUTES.items():
+        if not needs_params:
+            keys.append((path, ())); continue
+        keys.append((path, (None,) * len(FILTER_KEYS)))
+        for i, field in enumerate(FILTER_FIELDS):
+            for value in data.index[field]:
+                filters = [None] * len(FILTER_KEYS); filters[i] = value
+                keys.append((path, tuple(filters)))
+    return {key: cached_body.__wrapped__(*key, data) for key in keys}
+
 class Handler(SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=os.path.join(os.path.dirname(__file__), "static"), **kwargs)
+        super().__init__(*args, directory=os.path.join(BASE_DIR, "static"), **kwargs)
 
     def do_GET(self):
         parsed = urlparse(self.path)
         path = parsed.path
 
         if path in ROUTES:
-            fn, needs_params = ROUTES[path]
+            needs_params = ROUTES[path][1]
             try:
-                result = fn(get_params(parsed.query)) if needs_params else fn()
-                body = json.dumps(result).encode()
+                data = _read_rows()
+                filters = tuple(get_params(parsed.query).values()) if needs_params else ()
+                body, gz, digest = data.frozen.get((path, filters)) or cached_body(path, filters, data)
+                etag = '"%s"' % digest
+                use_gzip = gz is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+                if use_gzip:
+                    body, etag = gz, '"%s-gzip"' % digest
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Vary", "Accept-Encoding")
+                    self.end_headers()
+                    return
                 self.send_response(200)
                 self.send_header("Content-Type", "application/json")
                 self.send_header("Access-Control-Allow-Origin", "*")
-                self.send_header("Content-Length", len(body))
+                self.send_header("ETag", etag)
+                self.send_header("Vary", "Accept-Encoding")
+                if use_gzip: self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
                 self.end_headers()
                 self.wfile.write(body)
             except Exception as e:
@@ -193,4 +251,5 @@ if __name__ == "__main__":
     print(f"  Running at: http://localhost:{port}")
     print(f"  No dependencies required!")
     print(f"{'='*55}\n")
-    HTTPServer(("", port), Handler).serve_forever()
\ No newline at end of file
+    _read_rows()
+    ThreadingHTTPServer(("", port), Handler).serve_forever()
\ No newline at end of file